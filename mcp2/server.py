@@ -2,16 +2,25 @@
 """
 MCP Server using streamable HTTP for Claude Desktop
 """
+import asyncio
 import os
 import sys
 from fastmcp import FastMCP
 
+# uvloop gives cheaper asyncio scheduling for the HTTP transport; it is not
+# available on Windows, so fall back to the default loop there
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 mcp = FastMCP("HTTP Demo MCP")
 
 @mcp.tool
 def add_numbers(a: float, b: float) -> dict:
     """Add two numbers together."""
-    return {"result": a + b, "operation": f"{a} + {b} = {a + b}"}
+    total = a + b
+    return {"result": total, "operation": f"{a} + {b} = {total}"}
 
 @mcp.tool
 def get_info() -> dict:
@@ -24,6 +33,8 @@ def get_info() -> dict:
 
 if __name__ == "__main__":
     print("🔧 Starting HTTP MCP server...", file=sys.stderr)
+    if uvloop is not None and sys.platform != "win32":
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     port = int(os.getenv("PORT", 8000))
     mcp.run(
         transport="streamable-http",
@@ -11,13 +11,24 @@ This server demonstrates clean separation of concerns:
 import asyncio
 import aiohttp
 import json
+import orjson
 import re
+import sys
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
 from fastmcp import FastMCP
 
-# Initialize MCP server
-mcp = FastMCP("Financial Data Aggregation MCP")
+# Only advertise brotli when aiohttp can actually decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
 
 # API Configuration - All free, no authentication required
 COINGECKO_BASE = "https://api.coingecko.com/api/v3"
@@ -25,110 +36,430 @@ EXCHANGERATE_BASE = "https://api.exchangerate-api.com/v4/latest"
 CRYPTOPANIC_BASE = "https://cryptopanic.com/api/v1"
 REDDIT_CRYPTO_BASE = "https://www.reddit.com/r"
 
-class FinancialDataClient:
-    """Centralized client for financial data APIs"""
+# Request URLs and query parameters that never change between calls
+SIMPLE_PRICE_URL = f"{COINGECKO_BASE}/simple/price"
+SIMPLE_PRICE_PARAMS = {
+    'vs_currencies': 'usd',
+    'include_24hr_change': 'true',
+    'include_market_cap': 'true',
+    'include_24hr_vol': 'true',
+    'include_last_updated_at': 'true'
+}
+CRYPTOPANIC_HOT_URL = (
+    f"{CRYPTOPANIC_BASE}/posts/"
+    "?auth_token=free&currencies=BTC,ETH&filter=hot&public=true"
+)
+REDDIT_HOT_URL = f"{REDDIT_CRYPTO_BASE}/cryptocurrency/hot.json?limit=5"
+
+# Convert symbols to CoinGecko IDs (simplified mapping)
+_SYMBOL_MAP: Dict[str, str] = {
+    'bitcoin': 'bitcoin', 'btc': 'bitcoin',
+    'ethereum': 'ethereum', 'eth': 'ethereum',
+    'cardano': 'cardano', 'ada': 'cardano',
+    'solana': 'solana', 'sol': 'solana',
+    'dogecoin': 'dogecoin', 'doge': 'dogecoin'
+}
+
+# Focus on major currencies for clean exchange-rate data
+MAJOR_CURRENCIES = ('EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'CHF', 'CNY')
+
+# Cache lifetimes (seconds). Prices barely move within a minute and rates are
+# published daily, while CoinGecko's free-tier rate limit is the real bottleneck.
+PRICE_CACHE_TTL = 45
+RATES_CACHE_TTL = 300
+
+# Price lookups arriving within this window (seconds) of each other, e.g. from
+# several tool calls in the same LLM turn, share one simple/price request
+PRICE_BATCH_WINDOW = 0.05
+
+# Client-side request budgets (max requests, per seconds) so bursts of tool
+# calls queue up instead of tripping the upstream 429 penalty window
+RATE_LIMITS = {
+    "api.coingecko.com": (30, 60)
+}
+# Back-off used when a 429 response carries no usable Retry-After header
+DEFAULT_RETRY_AFTER = 60
+
+# Background refresh keeps the common lookups warm so tool calls rarely wait
+# on the network. The interval must stay below PRICE_CACHE_TTL.
+PREFETCH_INTERVAL = 30
+PREFETCH_COINS = ['bitcoin', 'ethereum', 'cardano', 'solana', 'dogecoin']
+PREFETCH_RATES_BASE = "USD"
+
+_last_iso: Tuple[int, str] = (0, "")
+
+def _now_iso() -> str:
+    """Current time as an ISO string, formatted at most once per second"""
+    global _last_iso
+    now = int(time.time())
+    if now != _last_iso[0]:
+        _last_iso = (now, datetime.fromtimestamp(now).isoformat())
+    return _last_iso[1]
+
+class RateLimiter:
+    """Admit at most `max_calls` requests in any `period`-second window"""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+            if len(self._calls) >= self.max_calls:
+                await asyncio.sleep(self.period - (now - self._calls.popleft()))
+            self._calls.append(time.monotonic())
 
-    def __init__(self):
-        self.session = None
+class FinancialDataClient:
+    """Centralized client for financial data APIs
 
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
+    A single instance (see get_client) is shared by all tools so the HTTP
+    session and its keep-alive connections survive between tool calls.
+    """
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Keyed by CoinGecko id / base currency -> (fetched_at, payload)
+        self._price_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._rates_cache: Dict[str, Tuple[float, Dict]] = {}
+        # Requests currently on the wire, keyed by URL + query string
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Ids queued for the next batched price request, and its pending result
+        self._price_batch: Optional[Tuple[set, asyncio.Future]] = None
+        self._price_flush: Optional[asyncio.Task] = None
+        self._limiters = {host: RateLimiter(*limit) for host, limit in RATE_LIMITS.items()}
+        # Host -> monotonic time until which the server asked us to back off
+        self._blocked_until: Dict[str, float] = {}
+
+    async def close(self):
+        if self.session and not self.session.closed:
             await self.session.close()
 
-    async def fetch_crypto_data(self, symbols: List[str]) -> Dict:
-        """Fetch cryptocurrency data from CoinGecko"""
-        # Convert symbols to CoinGecko IDs (simplified mapping)
-        symbol_map = {
-            'bitcoin': 'bitcoin', 'btc': 'bitcoin',
-            'ethereum': 'ethereum', 'eth': 'ethereum',
-            'cardano': 'cardano', 'ada': 'cardano',
-            'solana': 'solana', 'sol': 'solana',
-            'dogecoin': 'dogecoin', 'doge': 'dogecoin'
-        }
+    async def _get_json(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """GET a JSON document, returning None on a non-200 response
+
+        Identical concurrent requests share a single HTTP call.
+        """
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._request_json(url, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(task)
+
+    async def _request_json(self, url: str, params: Optional[Dict]) -> Optional[Dict]:
+        host = urlsplit(url).hostname
+        if time.monotonic() < self._blocked_until.get(host, 0):
+            return None
+
+        limiter = self._limiters.get(host)
+        if limiter is not None:
+            await limiter.acquire()
+
+        async with self.session.get(url, params=params) as response:
+            if response.status == 429:
+                try:
+                    retry_after = float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+                except ValueError:
+                    retry_after = DEFAULT_RETRY_AFTER
+                self._blocked_until[host] = time.monotonic() + retry_after
+                print(f"Rate limited by {host}, backing off for {retry_after:.0f}s", file=sys.stderr)
+                return None
+            self._check_remaining(host, response.headers)
+            if response.status != 200:
+                return None
+            return orjson.loads(await response.read())
+
+    def _check_remaining(self, host: str, headers) -> None:
+        """Pause a host once its advertised request budget is used up
+
+        Hosts that send X-RateLimit-Remaining get no further requests until
+        X-RateLimit-Reset (epoch or delta seconds), rather than a 429 first.
+        """
+        try:
+            remaining = float(headers.get("X-RateLimit-Remaining", 1))
+        except ValueError:
+            return
+        if remaining > 0:
+            return
+        try:
+            reset = float(headers.get("X-RateLimit-Reset", DEFAULT_RETRY_AFTER))
+        except ValueError:
+            reset = DEFAULT_RETRY_AFTER
+        # Large values are an epoch timestamp, small ones a delay
+        wait = max(reset - time.time() if reset > 1e9 else reset, 0)
+        self._blocked_until[host] = time.monotonic() + wait
+        print(f"Request budget for {host} used up, pausing for {wait:.0f}s", file=sys.stderr)
+
+    async def _fetch_prices(self, coin_ids: List[str]) -> Optional[Dict]:
+        """Queue ids for the next batched simple/price request and await it"""
+        if self._price_batch is None:
+            self._price_batch = (set(), asyncio.get_running_loop().create_future())
+            self._price_flush = asyncio.create_task(self._flush_price_batch())
+        pending, future = self._price_batch
+        pending.update(coin_ids)
+        return await asyncio.shield(future)
+
+    async def _flush_price_batch(self):
+        await asyncio.sleep(PRICE_BATCH_WINDOW)
+        pending, future = self._price_batch
+        self._price_batch = None
+        params = {**SIMPLE_PRICE_PARAMS, 'ids': ','.join(sorted(pending))}
+        try:
+            future.set_result(await self._get_json(SIMPLE_PRICE_URL, params))
+        except Exception as e:
+            future.set_exception(e)
 
-        mapped_symbols = [symbol_map.get(s.lower(), s.lower()) for s in symbols]
-        ids_string = ','.join(mapped_symbols)
-
-        url = f"{COINGECKO_BASE}/simple/price"
-        params = {
-            'ids': ids_string,
-            'vs_currencies': 'usd',
-            'include_24hr_change': 'true',
-            'include_market_cap': 'true',
-            'include_24hr_vol': 'true',
-            'include_last_updated_at': 'true'
-        }
+    async def fetch_crypto_data(self, symbols: List[str], use_cache: bool = True) -> Dict:
+        """Fetch cryptocurrency data from CoinGecko"""
+        mapped_symbols = [_SYMBOL_MAP.get(s.lower(), s.lower()) for s in symbols]
+
+        # Serve fresh prices from the cache and only ask CoinGecko for the rest.
+        # Aliases ('btc', 'bitcoin') collapse to one id in the batched query.
+        now = time.time()
+        result = {}
+        missing = []
+        for coin_id in dict.fromkeys(mapped_symbols):
+            cached = self._price_cache.get(coin_id)
+            if use_cache and cached and now - cached[0] < PRICE_CACHE_TTL:
+                result[coin_id] = cached[1]
+            else:
+                missing.append(coin_id)
+        if not missing:
+            return result
 
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
+            # The batch may also carry coins other callers asked for; cache
+            # everything but only return what was requested here
+            data = await self._fetch_prices(missing)
+            if data is not None:
+                fetched_at = time.time()
+                for coin_id, coin_data in data.items():
+                    self._price_cache[coin_id] = (fetched_at, coin_data)
+                result.update((coin_id, data[coin_id]) for coin_id in missing if coin_id in data)
         except Exception as e:
-            print(f"CoinGecko API error: {e}")
-        return {}
+            print(f"CoinGecko API error: {e}", file=sys.stderr)
+        return result
 
     async def fetch_news_data(self, sources: List[str]) -> Dict:
         """Fetch news from multiple sources"""
         news_data = {
             'cryptopanic': [],
             'reddit': [],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _now_iso()
         }
 
+        fetches = {}
         if 'cryptopanic' in sources or 'all' in sources:
-            try:
-                url = f"{CRYPTOPANIC_BASE}/posts/"
-                params = {
-                    'auth_token': 'free',
-                    'currencies': 'BTC,ETH',
-                    'filter': 'hot',
-                    'public': 'true'
-                }
-                async with self.session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        news_data['cryptopanic'] = data.get('results', [])[:5]
-            except Exception as e:
-                print(f"CryptoPanic error: {e}")
-
+            fetches['cryptopanic'] = self._fetch_cryptopanic()
         if 'reddit' in sources or 'all' in sources:
-            try:
-                url = f"{REDDIT_CRYPTO_BASE}/cryptocurrency/hot.json"
-                params = {'limit': 5}
-                async with self.session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        posts = data.get('data', {}).get('children', [])
-                        news_data['reddit'] = [
-                            {
-                                'title': post['data'].get('title', ''),
-                                'score': post['data'].get('score', 0),
-                                'num_comments': post['data'].get('num_comments', 0),
-                                'created_utc': post['data'].get('created_utc', 0),
-                                'upvote_ratio': post['data'].get('upvote_ratio', 0)
-                            }
-                            for post in posts[:5]
-                        ]
-            except Exception as e:
-                print(f"Reddit error: {e}")
+            fetches['reddit'] = self._fetch_reddit()
 
+        # The feeds are independent, so fetch them concurrently
+        results = await asyncio.gather(*fetches.values())
+        news_data.update(zip(fetches, results))
         return news_data
 
-    async def fetch_exchange_rates(self, base: str) -> Dict:
+    async def _fetch_cryptopanic(self) -> List[Dict]:
+        """Fetch hot CryptoPanic posts, or an empty list on failure"""
+        try:
+            data = await self._get_json(CRYPTOPANIC_HOT_URL)
+            if data is not None:
+                return data.get('results', [])[:5]
+        except Exception as e:
+            print(f"CryptoPanic error: {e}", file=sys.stderr)
+        return []
+
+    async def _fetch_reddit(self) -> List[Dict]:
+        """Fetch hot r/cryptocurrency posts, or an empty list on failure"""
+        try:
+            data = await self._get_json(REDDIT_HOT_URL)
+            if data is not None:
+                posts = data.get('data', {}).get('children', [])
+                return [
+                    {
+                        'title': post['data'].get('title', ''),
+                        'score': post['data'].get('score', 0),
+                        'num_comments': post['data'].get('num_comments', 0),
+                        'created_utc': post['data'].get('created_utc', 0),
+                        'upvote_ratio': post['data'].get('upvote_ratio', 0)
+                    }
+                    for post in posts[:5]
+                ]
+        except Exception as e:
+            print(f"Reddit error: {e}", file=sys.stderr)
+        return []
+
+    async def fetch_exchange_rates(self, base: str, use_cache: bool = True) -> Dict:
         """Fetch currency exchange rates"""
+        cached = self._rates_cache.get(base)
+        if use_cache and cached and time.time() - cached[0] < RATES_CACHE_TTL:
+            return cached[1]
+
         url = f"{EXCHANGERATE_BASE}/{base}"
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    return await response.json()
+            data = await self._get_json(url)
+            if data is not None:
+                self._rates_cache[base] = (time.time(), data)
+                return data
         except Exception as e:
-            print(f"Exchange rate error: {e}")
+            print(f"Exchange rate error: {e}", file=sys.stderr)
         return {}
 
+_client: Optional[FinancialDataClient] = None
+
+async def get_client() -> FinancialDataClient:
+    """Return the shared client, opening its HTTP session on first use"""
+    global _client
+    if _client is None:
+        _client = FinancialDataClient()
+    if _client.session is None or _client.session.closed:
+        # Long keep-alive so idle gaps between tool calls still reuse warm
+        # TLS connections; DNS is cached to skip repeated lookups.
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=64,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+            force_close=False
+        )
+        _client.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=15, connect=5),
+            headers={
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "User-Agent": "mcp-financial/1.0"
+            }
+        )
+    return _client
+
+async def _price_refresher():
+    """Periodically refill the price and rate caches in the background
+
+    Runs whether or not a tool is being called, so anything it logs must go to
+    stderr: stdout is the stdio transport's JSON-RPC channel.
+    """
+    while True:
+        try:
+            client = await get_client()
+            await asyncio.gather(
+                client.fetch_crypto_data(PREFETCH_COINS, use_cache=False),
+                client.fetch_exchange_rates(PREFETCH_RATES_BASE, use_cache=False)
+            )
+        except Exception as e:
+            print(f"Cache refresh error: {e}", file=sys.stderr)
+        await asyncio.sleep(PREFETCH_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(server):
+    """Run the cache refresher and close the shared HTTP session on shutdown"""
+    refresher = asyncio.create_task(_price_refresher())
+    try:
+        yield
+    finally:
+        refresher.cancel()
+        if _client is not None:
+            await _client.close()
+
+# Initialize MCP server
+mcp = FastMCP("Financial Data Aggregation MCP", lifespan=lifespan)
+
+# Static tool responses, built once at import instead of on every call
+RISK_PROFILE = {
+    "risk_profile": [
+        "Conservative investors should limit crypto allocation to 5-10% of total portfolio, focusing on Bitcoin and Ethereum with 6+ month holding periods.",
+        "Moderate risk tolerance allows 10-20% crypto allocation across 3-4 major cryptocurrencies, accepting 20-30% volatility swings as normal market behavior.",
+        "Aggressive investors can allocate 20-40% to crypto including smaller-cap altcoins, but must prepare for 50%+ drawdowns and multi-year recovery periods.",
+        "Never invest more than you can afford to lose completely - cryptocurrency markets can experience 80-90% crashes during bear market cycles.",
+        "Dollar-cost averaging over 6-12 months reduces timing risk, while taking profits at 2x-3x gains helps lock in returns during bull markets."
+    ],
+    "volatility_expectations": {
+        "bitcoin": "Daily: ±5%, Monthly: ±25%, Annual: ±75%",
+        "ethereum": "Daily: ±7%, Monthly: ±35%, Annual: ±85%",
+        "altcoins": "Daily: ±10%, Monthly: ±50%, Annual: ±90%"
+    },
+    "key_principles": {
+        "diversification": "Spread risk across multiple assets and time periods",
+        "position_sizing": "Size positions based on conviction and risk tolerance",
+        "time_horizon": "Minimum 12-18 months for any crypto investment",
+        "emotional_discipline": "Avoid FOMO buying and panic selling during extreme moves"
+    },
+    "profile_version": "1.0",
+    "last_updated": "2025-08-01"
+}
+
+SERVER_INFO = {
+    "server_name": "Financial Data Aggregation MCP",
+    "strategy": "Data Collection & Aggregation (LLM handles intelligence)",
+    "tools": [
+        {
+            "name": "get_market_data",
+            "purpose": "Clean price/volume data aggregation",
+            "llm_uses": "Trend analysis, comparison, risk assessment"
+        },
+        {
+            "name": "get_news_feed",
+            "purpose": "Structured news aggregation",
+            "llm_uses": "Context building, sentiment synthesis, event correlation"
+        },
+        {
+            "name": "get_trading_rules",
+            "purpose": "Business rules as structured data",
+            "llm_uses": "Apply consistent decision framework"
+        },
+        {
+            "name": "get_currency_rates",
+            "purpose": "Currency exchange data",
+            "llm_uses": "Multi-currency analysis, purchasing power comparison"
+        }
+    ],
+    "demo_scenarios": [
+        "Should I invest in Bitcoin or Ethereum?",
+        "What's happening in crypto markets today?",
+        "Compare Bitcoin price in different currencies",
+        "Analyze recent crypto news sentiment"
+    ],
+    "data_sources": [
+        "CoinGecko API (market data)",
+        "CryptoPanic API (news)",
+        "Reddit API (social sentiment)",
+        "ExchangeRate-API (currency rates)"
+    ],
+    "key_principle": "MCP provides clean data, Claude provides intelligence"
+}
+
+SUPPORTED_ASSETS = {
+    "cryptocurrencies": {
+        "major": ["bitcoin", "ethereum", "cardano", "solana", "dogecoin"],
+        "aliases": {
+            "btc": "bitcoin",
+            "eth": "ethereum",
+            "ada": "cardano",
+            "sol": "solana",
+            "doge": "dogecoin"
+        }
+    },
+    "fiat_currencies": {
+        "supported": ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY"],
+        "base_options": ["USD", "EUR", "GBP"]
+    },
+    "news_sources": {
+        "available": ["cryptopanic", "reddit", "all"],
+        "descriptions": {
+            "cryptopanic": "Crypto-focused news aggregator",
+            "reddit": "Social sentiment from r/cryptocurrency",
+            "all": "Combined data from all sources"
+        }
+    }
+}
+
 # =============================================================================
 # MCP TOOLS - Data Collection & Aggregation Only
 # =============================================================================
@@ -143,35 +474,35 @@ async def get_market_data(symbols: List[str]) -> Dict:
     Args:
         symbols: List of crypto symbols (e.g., ['bitcoin', 'ethereum', 'cardano'])
     """
-    async with FinancialDataClient() as client:
-        raw_data = await client.fetch_crypto_data(symbols)
-
-        if not raw_data:
-            return {
-                "error": "Failed to fetch market data",
-                "requested_symbols": symbols,
-                "timestamp": datetime.now().isoformat()
-            }
-
-        # Structure the data cleanly for LLM consumption
-        market_data = {}
-        for symbol_id, data in raw_data.items():
-            market_data[symbol_id] = {
-                "price_usd": data.get('usd', 0),
-                "change_24h_percent": round(data.get('usd_24h_change', 0), 2),
-                "market_cap": data.get('usd_market_cap', 0),
-                "volume_24h": data.get('usd_24h_vol', 0),
-                "last_updated": data.get('last_updated_at', 0)
-            }
+    client = await get_client()
+    raw_data = await client.fetch_crypto_data(symbols)
 
+    if not raw_data:
         return {
-            "market_data": market_data,
-            "data_source": "CoinGecko API",
-            "timestamp": datetime.now().isoformat(),
-            "symbols_found": len(market_data),
-            "symbols_requested": len(symbols)
+            "error": "Failed to fetch market data",
+            "requested_symbols": symbols,
+            "timestamp": _now_iso()
         }
 
+    # Structure the data cleanly for LLM consumption
+    market_data = {}
+    for symbol_id, data in raw_data.items():
+        market_data[symbol_id] = {
+            "price_usd": data.get('usd', 0),
+            "change_24h_percent": round(data.get('usd_24h_change', 0), 2),
+            "market_cap": data.get('usd_market_cap', 0),
+            "volume_24h": data.get('usd_24h_vol', 0),
+            "last_updated": data.get('last_updated_at', 0)
+        }
+
+    return {
+        "market_data": market_data,
+        "data_source": "CoinGecko API",
+        "timestamp": _now_iso(),
+        "symbols_found": len(market_data),
+        "symbols_requested": len(symbols)
+    }
+
 @mcp.tool
 async def get_news_feed(sources: List[str] = ["all"]) -> Dict:
     """Fetch structured news data from multiple sources.
@@ -182,53 +513,55 @@ async def get_news_feed(sources: List[str] = ["all"]) -> Dict:
     Args:
         sources: News sources to fetch from (['cryptopanic', 'reddit', 'all'])
     """
-    async with FinancialDataClient() as client:
-        news_data = await client.fetch_news_data(sources)
-
-        # Structure news data for easy LLM processing
-        structured_news = {
-            "news_sources": {},
-            "total_items": 0,
-            "fetch_timestamp": news_data.get('timestamp'),
-            "sources_requested": sources
-        }
+    client = await get_client()
+    news_data = await client.fetch_news_data(sources)
+
+    # Structure news data for easy LLM processing
+    structured_news = {
+        "news_sources": {},
+        "total_items": 0,
+        "fetch_timestamp": news_data.get('timestamp'),
+        "sources_requested": sources
+    }
 
-        # Process CryptoPanic news
-        if news_data.get('cryptopanic'):
-            cryptopanic_items = []
-            for item in news_data['cryptopanic']:
-                cryptopanic_items.append({
-                    "title": item.get('title', ''),
-                    "published_at": item.get('published_at', ''),
-                    "source": item.get('source', {}).get('title', 'Unknown'),
-                    "currencies": item.get('currencies', []),
-                    "kind": item.get('kind', 'news')
-                })
-            structured_news["news_sources"]["cryptopanic"] = {
-                "items": cryptopanic_items,
-                "count": len(cryptopanic_items)
+    # Process CryptoPanic news
+    if news_data.get('cryptopanic'):
+        cryptopanic_items = [
+            {
+                "title": item.get('title', ''),
+                "published_at": item.get('published_at', ''),
+                "source": item.get('source', {}).get('title', 'Unknown'),
+                "currencies": item.get('currencies', []),
+                "kind": item.get('kind', 'news')
             }
-            structured_news["total_items"] += len(cryptopanic_items)
-
-        # Process Reddit data
-        if news_data.get('reddit'):
-            reddit_items = []
-            for item in news_data['reddit']:
-                reddit_items.append({
-                    "title": item.get('title', ''),
-                    "engagement_score": item.get('score', 0),
-                    "comment_count": item.get('num_comments', 0),
-                    "upvote_ratio": item.get('upvote_ratio', 0),
-                    "created_utc": item.get('created_utc', 0)
-                })
-            structured_news["news_sources"]["reddit"] = {
-                "items": reddit_items,
-                "count": len(reddit_items),
-                "avg_engagement": sum(item['engagement_score'] for item in reddit_items) / len(reddit_items) if reddit_items else 0
+            for item in news_data['cryptopanic']
+        ]
+        structured_news["news_sources"]["cryptopanic"] = {
+            "items": cryptopanic_items,
+            "count": len(cryptopanic_items)
+        }
+        structured_news["total_items"] += len(cryptopanic_items)
+
+    # Process Reddit data
+    if news_data.get('reddit'):
+        reddit_items = [
+            {
+                "title": item.get('title', ''),
+                "engagement_score": item.get('score', 0),
+                "comment_count": item.get('num_comments', 0),
+                "upvote_ratio": item.get('upvote_ratio', 0),
+                "created_utc": item.get('created_utc', 0)
             }
-            structured_news["total_items"] += len(reddit_items)
+            for item in news_data['reddit']
+        ]
+        structured_news["news_sources"]["reddit"] = {
+            "items": reddit_items,
+            "count": len(reddit_items),
+            "avg_engagement": sum(map(itemgetter('engagement_score'), reddit_items)) / len(reddit_items)
+        }
+        structured_news["total_items"] += len(reddit_items)
 
-        return structured_news
+    return structured_news
 
 @mcp.tool
 def get_risk_profile() -> Dict:
@@ -237,28 +570,7 @@ def get_risk_profile() -> Dict:
     Returns risk profile as structured data without applying it.
     LLM uses this for: applying consistent risk logic, explaining investment reasoning.
     """
-    return {
-        "risk_profile": [
-            "Conservative investors should limit crypto allocation to 5-10% of total portfolio, focusing on Bitcoin and Ethereum with 6+ month holding periods.",
-            "Moderate risk tolerance allows 10-20% crypto allocation across 3-4 major cryptocurrencies, accepting 20-30% volatility swings as normal market behavior.",
-            "Aggressive investors can allocate 20-40% to crypto including smaller-cap altcoins, but must prepare for 50%+ drawdowns and multi-year recovery periods.",
-            "Never invest more than you can afford to lose completely - cryptocurrency markets can experience 80-90% crashes during bear market cycles.",
-            "Dollar-cost averaging over 6-12 months reduces timing risk, while taking profits at 2x-3x gains helps lock in returns during bull markets."
-        ],
-        "volatility_expectations": {
-            "bitcoin": "Daily: ±5%, Monthly: ±25%, Annual: ±75%",
-            "ethereum": "Daily: ±7%, Monthly: ±35%, Annual: ±85%",
-            "altcoins": "Daily: ±10%, Monthly: ±50%, Annual: ±90%"
-        },
-        "key_principles": {
-            "diversification": "Spread risk across multiple assets and time periods",
-            "position_sizing": "Size positions based on conviction and risk tolerance",
-            "time_horizon": "Minimum 12-18 months for any crypto investment",
-            "emotional_discipline": "Avoid FOMO buying and panic selling during extreme moves"
-        },
-        "profile_version": "1.0",
-        "last_updated": "2025-08-01"
-    }
+    return RISK_PROFILE
 
 @mcp.tool
 async def get_currency_rates(base: str = "USD") -> Dict:
@@ -270,35 +582,29 @@ async def get_currency_rates(base: str = "USD") -> Dict:
     Args:
         base: Base currency for rates (default: USD)
     """
-    async with FinancialDataClient() as client:
-        rate_data = await client.fetch_exchange_rates(base)
-
-        if not rate_data:
-            return {
-                "error": "Failed to fetch exchange rates",
-                "base_currency": base,
-                "timestamp": datetime.now().isoformat()
-            }
-
-        # Focus on major currencies for clean data
-        major_currencies = ['EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'CHF', 'CNY']
-        major_rates = {}
-
-        rates = rate_data.get('rates', {})
-        for currency in major_currencies:
-            if currency in rates:
-                major_rates[currency] = rates[currency]
+    client = await get_client()
+    rate_data = await client.fetch_exchange_rates(base)
 
+    if not rate_data:
         return {
+            "error": "Failed to fetch exchange rates",
             "base_currency": base,
-            "rates": major_rates,
-            "all_rates_count": len(rates),
-            "major_rates_count": len(major_rates),
-            "last_updated": rate_data.get('date', ''),
-            "timestamp": datetime.now().isoformat(),
-            "data_source": "ExchangeRate-API"
+            "timestamp": _now_iso()
         }
 
+    rates = rate_data.get('rates', {})
+    major_rates = {c: rates[c] for c in MAJOR_CURRENCIES if c in rates}
+
+    return {
+        "base_currency": base,
+        "rates": major_rates,
+        "all_rates_count": len(rates),
+        "major_rates_count": len(major_rates),
+        "last_updated": rate_data.get('date', ''),
+        "timestamp": _now_iso(),
+        "data_source": "ExchangeRate-API"
+    }
+
 # =============================================================================
 # Helper Tools
 # =============================================================================
@@ -306,73 +612,12 @@ async def get_currency_rates(base: str = "USD") -> Dict:
 @mcp.tool
 def get_server_info() -> Dict:
     """Get information about this MCP server and its capabilities."""
-    return {
-        "server_name": "Financial Data Aggregation MCP",
-        "strategy": "Data Collection & Aggregation (LLM handles intelligence)",
-        "tools": [
-            {
-                "name": "get_market_data",
-                "purpose": "Clean price/volume data aggregation",
-                "llm_uses": "Trend analysis, comparison, risk assessment"
-            },
-            {
-                "name": "get_news_feed",
-                "purpose": "Structured news aggregation",
-                "llm_uses": "Context building, sentiment synthesis, event correlation"
-            },
-            {
-                "name": "get_trading_rules",
-                "purpose": "Business rules as structured data",
-                "llm_uses": "Apply consistent decision framework"
-            },
-            {
-                "name": "get_currency_rates",
-                "purpose": "Currency exchange data",
-                "llm_uses": "Multi-currency analysis, purchasing power comparison"
-            }
-        ],
-        "demo_scenarios": [
-            "Should I invest in Bitcoin or Ethereum?",
-            "What's happening in crypto markets today?",
-            "Compare Bitcoin price in different currencies",
-            "Analyze recent crypto news sentiment"
-        ],
-        "data_sources": [
-            "CoinGecko API (market data)",
-            "CryptoPanic API (news)",
-            "Reddit API (social sentiment)",
-            "ExchangeRate-API (currency rates)"
-        ],
-        "key_principle": "MCP provides clean data, Claude provides intelligence"
-    }
+    return SERVER_INFO
 
 @mcp.tool
 def get_supported_assets() -> Dict:
     """Get list of supported cryptocurrencies and currencies."""
-    return {
-        "cryptocurrencies": {
-            "major": ["bitcoin", "ethereum", "cardano", "solana", "dogecoin"],
-            "aliases": {
-                "btc": "bitcoin",
-                "eth": "ethereum",
-                "ada": "cardano",
-                "sol": "solana",
-                "doge": "dogecoin"
-            }
-        },
-        "fiat_currencies": {
-            "supported": ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY"],
-            "base_options": ["USD", "EUR", "GBP"]
-        },
-        "news_sources": {
-            "available": ["cryptopanic", "reddit", "all"],
-            "descriptions": {
-                "cryptopanic": "Crypto-focused news aggregator",
-                "reddit": "Social sentiment from r/cryptocurrency",
-                "all": "Combined data from all sources"
-            }
-        }
-    }
+    return SUPPORTED_ASSETS
 
 if __name__ == "__main__":
     print("🚀 Starting Financial Data Aggregation MCP Server")
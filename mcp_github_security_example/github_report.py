@@ -1,10 +1,18 @@
 # github_report.py
+import hashlib
+import orjson
 import requests
+import sys
+import threading
 import time
 from datetime import datetime
-from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from urllib.parse import parse_qs, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-GENERIC_SECRET_TYPES = [
+GENERIC_SECRET_TYPES = frozenset({
     "password",
     "http_basic_authentication_header",
     "http_bearer_authentication_header",
@@ -14,22 +22,105 @@ GENERIC_SECRET_TYPES = [
     "pgp_private_key",
     "postgres_connection_string",
     "rsa_private_key"
-]
+})
+_GENERIC_SECRET_TYPES_PARAM = ",".join(sorted(GENERIC_SECRET_TYPES))
 
-_cache = {"timestamp": 0, "data": None}
+# Shared fallback for missing nested objects, so the per-alert lookups don't
+# allocate a throwaway dict each time. Never mutated.
+_EMPTY = {}
+
+CACHE_TTL = 600
+
+# (token digest, org) -> (timestamp, summary); tokens are never kept in plain text
+_cache = {}
+_cache_lock = threading.Lock()
+
+# (token digest, url, query) -> (timestamp, etag, data, links) for pages fetched
+# within CACHE_TTL, so repeat fetches can be conditional and a 304 reuses the
+# stored page. Guarded by _cache_lock and swept alongside _cache.
+_page_cache = {}
+
+# Concurrent page requests per endpoint; keeps us well inside GitHub's
+# secondary rate limits while overlapping the round trips
+PAGE_WORKERS = 8
+
+# One pooled session for all GitHub calls so pages reuse the same TLS connection.
+# The pool is sized for the five alert listings (code scanning, Dependabot and
+# two secret-scanning queries) each fetching PAGE_WORKERS pages at once, plus
+# the rate_limit call.
+_session = requests.Session()
+_session.headers["Accept"] = "application/vnd.github+json"
+_session.mount("https://", HTTPAdapter(
+    pool_maxsize=5 * PAGE_WORKERS + 1,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
+
+def _digest(secret):
+    return hashlib.blake2b(secret.encode(), digest_size=8).hexdigest()
+
+# Returns (data, links, stale_links) for one page; data is None if the URL is
+# inaccessible, and stale_links is True when links came from the page cache
+# rather than this response. The returned data may be shared with the page
+# cache and must not be mutated.
+def fetch_page(url, headers, params, page):
+    actual_params = params.copy() if params else {}
+    actual_params['page'] = page
+    key = (_digest(headers.get("Authorization", "")), url, tuple(sorted(actual_params.items())))
+    with _cache_lock:
+        cached = _page_cache.get(key)
+    request_headers = {**headers, "If-None-Match": cached[1]} if cached else headers
+    response = _session.get(url, headers=request_headers, params=actual_params, timeout=10)
+    if response.status_code == 304 and cached:
+        # The body is unchanged but the page count may not be; prefer the
+        # Link header GitHub sent with the 304 over the stored one
+        links = response.links or cached[3]
+        with _cache_lock:
+            _page_cache[key] = (time.time(), cached[1], cached[2], links)
+        return cached[2], links, not response.links
+    if response.status_code == 403:
+        print(f"⚠️ Skipping inaccessible URL: {url}", file=sys.stderr)
+        return None, {}, False
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    etag = response.headers.get("ETag")
+    if etag:
+        with _cache_lock:
+            _page_cache[key] = (time.time(), etag, data, response.links)
+    return data, response.links, False
+
+def last_page(links):
+    last_url = links.get("last", {}).get("url")
+    if not last_url:
+        return None
+    pages = parse_qs(urlparse(last_url).query).get("page")
+    return int(pages[0]) if pages else None
 
 def fetch_all_pages(url, headers, params=None):
-    alerts = []
-    page = 1
-    while True:
-        actual_params = params.copy() if params else {}
-        actual_params['page'] = page
-        response = requests.get(url, headers=headers, params=actual_params)
-        if response.status_code == 403:
-            print(f"⚠️ Skipping inaccessible URL: {url}")
-            break
-        response.raise_for_status()
-        data = response.json()
+    per_page = (params or _EMPTY).get("per_page", 30)
+    first, links, stale = fetch_page(url, headers, params, 1)
+    if not first:
+        return []
+    alerts = list(first)
+    data = first
+    page = 2
+
+    last = last_page(links)
+    if last is not None:
+        # GitHub told us how many pages there are, so fetch the rest concurrently
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+            for data in pool.map(lambda page: fetch_page(url, headers, params, page)[0], range(2, last + 1)):
+                if data is None:
+                    break
+                alerts.extend(data)
+        page = last + 1
+        links = _EMPTY
+
+    # Otherwise follow rel="next" rather than probing for an empty page (a
+    # single-page result carries no Link header at all). Links reused from the
+    # page cache can understate the page count, so then also keep going past
+    # a full page.
+    while data and ("next" in links or (stale and len(data) == per_page)):
+        data, links, stale = fetch_page(url, headers, params, page)
         if not data:
             break
         alerts.extend(data)
@@ -38,9 +129,9 @@ def fetch_all_pages(url, headers, params=None):
 
 def get_rate_limit(headers):
     url = "https://api.github.com/rate_limit"
-    response = requests.get(url, headers=headers)
+    response = _session.get(url, headers=headers, timeout=10)
     response.raise_for_status()
-    data = response.json()
+    data = orjson.loads(response.content)
     rate = data["rate"]
     return {
         "Limit": rate["limit"],
@@ -48,95 +139,118 @@ def get_rate_limit(headers):
         "Resets At": datetime.fromtimestamp(rate["reset"]).strftime("%Y-%m-%d %H:%M:%S")
     }
 
-def summarize_alerts_by_repo(alerts, type_label):
-    repo_summary = defaultdict(lambda: defaultdict(lambda: {"total": 0, "by_severity": Counter()}))
-    for alert in alerts:
-        repo = alert.get("repository", {}).get("name", "unknown")
-        severity = alert.get("rule", {}).get("severity", "unknown") if type_label == "code_scanning" else \
-            alert.get("security_advisory", {}).get("severity", "unknown") if type_label == "dependabot" else "info"
-        repo_summary[repo][type_label]["total"] += 1
-        repo_summary[repo][type_label]["by_severity"][severity] += 1
-    return repo_summary
+@dataclass(slots=True)
+class RepoTypeSummary:
+    total: int = 0
+    by_severity: dict = field(default_factory=dict)
+
+# Returns repos[repo], creating it if needed. Each summary fills its own repos
+# dict so results can be merged in a fixed order whatever the thread timing.
+def repo_entry(repos, repo):
+    entry = repos.get(repo)
+    if entry is None:
+        entry = repos[repo] = RepoTypeSummary()
+    return entry
 
 def code_scanning_summary(headers, org):
     if not org or org == "-":
-        return 0, Counter(), Counter(), {}
+        return 0, {}, {}, {}
     url = f"https://api.github.com/orgs/{org}/code-scanning/alerts"
     alerts = fetch_all_pages(url, headers, {"state": "open", "per_page": 100})
-    severity_counter = Counter()
-    tool_counter = Counter()
+    severity_counter = {}
+    tool_counter = {}
+    repos = {}
     for alert in alerts:
-        severity_counter[alert.get("rule", {}).get("severity", "unknown")] += 1
-        tool_counter[alert.get("tool", {}).get("name", "unknown")] += 1
-    repo_data = summarize_alerts_by_repo(alerts, "code_scanning")
-    return len(alerts), severity_counter, tool_counter, repo_data
+        severity = (alert.get("rule") or _EMPTY).get("severity", "unknown")
+        severity_counter[severity] = severity_counter.get(severity, 0) + 1
+        tool = (alert.get("tool") or _EMPTY).get("name", "unknown")
+        tool_counter[tool] = tool_counter.get(tool, 0) + 1
+        entry = repo_entry(repos, (alert.get("repository") or _EMPTY).get("name", "unknown"))
+        entry.total += 1
+        entry.by_severity[severity] = entry.by_severity.get(severity, 0) + 1
+    return len(alerts), severity_counter, tool_counter, repos
 
 def secret_scanning_summary(headers, org):
     if not org or org == "-":
         return 0, 0, {}
     url = f"https://api.github.com/orgs/{org}/secret-scanning/alerts"
-    all_alerts = fetch_all_pages(url, headers, {"state": "open", "per_page": 100})
     generic_params = {
         "state": "open",
         "per_page": 100,
-        "secret_type": ",".join(GENERIC_SECRET_TYPES)
+        "secret_type": _GENERIC_SECRET_TYPES_PARAM
     }
-    generic_alerts = fetch_all_pages(url, headers, generic_params)
-    default_alerts = [a for a in all_alerts if a["secret_type"] not in GENERIC_SECRET_TYPES]
-    repo_data = summarize_alerts_by_repo(all_alerts, "secret_scanning")
-    return len(default_alerts), len(generic_alerts), repo_data
+    # The unfiltered listing only covers default patterns; generic secrets are
+    # returned only when named in secret_type, so fetch both at once
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        generic_future = pool.submit(fetch_all_pages, url, headers, generic_params)
+        all_alerts = fetch_all_pages(url, headers, {"state": "open", "per_page": 100})
+    default = 0
+    repos = {}
+    for alert in all_alerts:
+        if alert["secret_type"] not in GENERIC_SECRET_TYPES:
+            default += 1
+        entry = repo_entry(repos, (alert.get("repository") or _EMPTY).get("name", "unknown"))
+        entry.total += 1
+        entry.by_severity["info"] = entry.by_severity.get("info", 0) + 1
+    return default, len(generic_future.result()), repos
 
 def dependabot_summary(headers, org):
     if not org or org == "-":
-        return 0, Counter(), {}
+        return 0, {}, {}
     url = f"https://api.github.com/orgs/{org}/dependabot/alerts"
     alerts = fetch_all_pages(url, headers, {"state": "open", "per_page": 100})
-    severity_counter = Counter()
+    severity_counter = {}
+    repos = {}
     for alert in alerts:
-        severity_counter[alert.get("security_advisory", {}).get("severity", "unknown")] += 1
-    repo_data = summarize_alerts_by_repo(alerts, "dependabot")
-    return len(alerts), severity_counter, repo_data
+        severity = (alert.get("security_advisory") or _EMPTY).get("severity", "unknown")
+        severity_counter[severity] = severity_counter.get(severity, 0) + 1
+        entry = repo_entry(repos, (alert.get("repository") or _EMPTY).get("name", "unknown"))
+        entry.total += 1
+        entry.by_severity[severity] = entry.by_severity.get(severity, 0) + 1
+    return len(alerts), severity_counter, repos
+
+def _cache_key(token, org):
+    return _digest(token), org or ""
 
 def load_summary(token: str, org: str = None, use_cache=True) -> dict:
-    global _cache
-    if use_cache and _cache["data"] and time.time() - _cache["timestamp"] < 600:
-        return _cache["data"]
+    key = _cache_key(token, org)
+    if use_cache:
+        with _cache_lock:
+            entry = _cache.get(key)
+        if entry and time.time() - entry[0] < CACHE_TTL:
+            return entry[1]
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json"
-    }
+    headers = {"Authorization": f"Bearer {token}"}
 
-    rate = get_rate_limit(headers)
-    code_total, code_sev, code_tool, code_repos = code_scanning_summary(headers, org)
-    secret_default, secret_generic, secret_repos = secret_scanning_summary(headers, org)
-    dep_total, dep_sev, dep_repos = dependabot_summary(headers, org)
-
-    per_repo = defaultdict(dict)
-    for dataset in [code_repos, secret_repos, dep_repos]:
-        for repo, types in dataset.items():
-            for typ, data in types.items():
-                if typ not in per_repo[repo]:
-                    per_repo[repo][typ] = {"total": 0, "by_severity": {}}
-                per_repo[repo][typ]["total"] += data["total"]
-                for sev, count in data["by_severity"].items():
-                    per_repo[repo][typ]["by_severity"].setdefault(sev, 0)
-                    per_repo[repo][typ]["by_severity"][sev] += count
+    # The endpoints are independent, so query them concurrently
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        rate_future = pool.submit(get_rate_limit, headers)
+        code_future = pool.submit(code_scanning_summary, headers, org)
+        secret_future = pool.submit(secret_scanning_summary, headers, org)
+        dep_future = pool.submit(dependabot_summary, headers, org)
+    rate = rate_future.result()
+    code_total, code_sev, code_tool, code_repos = code_future.result()
+    secret_default, secret_generic, secret_repos = secret_future.result()
+    dep_total, dep_sev, dep_repos = dep_future.result()
 
+    # Merge in a fixed type order so identical data always gives identical
+    # output, converting to plain dicts once, at the API boundary
+    per_repo = {}
+    high = {}
+    for typ, repos in (("code_scanning", code_repos), ("secret_scanning", secret_repos), ("dependabot", dep_repos)):
+        for repo, typ_data in repos.items():
+            per_repo.setdefault(repo, {})[typ] = asdict(typ_data)
+            high[repo] = high.get(repo, 0) + typ_data.by_severity.get("high", 0)
     for repo, data in per_repo.items():
-        total_high = sum(
-            typ_data["by_severity"].get("high", 0)
-            for typ_data in data.values()
-        )
-        data["problematic"] = total_high >= 5
+        data["problematic"] = high[repo] >= 5
 
     result = {
         "rate_limit": rate,
         "totals": {
             "code_scanning": {
                 "total": code_total,
-                "by_severity": dict(code_sev),
-                "tools": dict(code_tool)
+                "by_severity": code_sev,
+                "tools": code_tool
             },
             "secret_scanning": {
                 "default": secret_default,
@@ -144,12 +258,17 @@ def load_summary(token: str, org: str = None, use_cache=True) -> dict:
             },
             "dependabot": {
                 "total": dep_total,
-                "by_severity": dict(dep_sev)
+                "by_severity": dep_sev
             }
         },
-        "per_repository": dict(per_repo)
+        "per_repository": per_repo
     }
 
-    _cache["data"] = result
-    _cache["timestamp"] = time.time()
+    now = time.time()
+    with _cache_lock:
+        for stale in [k for k, (ts, _) in _cache.items() if now - ts >= CACHE_TTL]:
+            del _cache[stale]
+        for stale in [k for k, page in _page_cache.items() if now - page[0] >= CACHE_TTL]:
+            del _page_cache[stale]
+        _cache[key] = (now, result)
     return result